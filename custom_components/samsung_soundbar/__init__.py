@@ -1,11 +1,9 @@
 """Samsung Soundbar Custom Component."""
 import asyncio
-import logging
 
 from homeassistant import config_entries, core
 
-from .const import DEFAULT_PORT, DOMAIN
-from .media_player import SoundbarAPI
+from .const import DOMAIN
 
 
 async def async_setup_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> bool:
@@ -14,7 +12,7 @@ async def async_setup_entry(hass: core.HomeAssistant, entry: config_entries.Conf
     hass.data.setdefault(DOMAIN, {})
     hass_data = dict(entry.data)
     unsub_options_update_listener = entry.add_update_listener(options_update_listener)
-    hass.data["unsub_options_update_listener"] = unsub_options_update_listener
+    hass_data["unsub_options_update_listener"] = unsub_options_update_listener
     hass.data[DOMAIN][entry.entry_id] = hass_data
 
     # Load other platforms like light, switch, media_player, etc.
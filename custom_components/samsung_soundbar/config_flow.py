@@ -6,6 +6,11 @@ import voluptuous as vol
 
 from .const import DEFAULT_PORT, DOMAIN
 
+_USER_SCHEMA = vol.Schema({
+    vol.Required(CONF_HOST): str,
+    vol.Optional(CONF_PORT, default=DEFAULT_PORT): vol.Coerce(int),
+})
+
 
 class SoundbarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Soundbar."""
@@ -25,6 +30,7 @@ class SoundbarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # Verify the configuration. If it fails, show the form again with an error message.
             ip_address = user_input[CONF_HOST]
             port = user_input.get(CONF_PORT, DEFAULT_PORT)
+            self._async_abort_entries_match({CONF_HOST: ip_address, CONF_PORT: port})
             if await self._test_connection(ip_address, port):
                 return self.async_create_entry(title="Soundbar", data=user_input)
             else:
@@ -33,10 +39,7 @@ class SoundbarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # Show initial configuration form
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required(CONF_HOST): str,
-                vol.Optional(CONF_PORT, default=DEFAULT_PORT): vol.Coerce(int),
-            }),
+            data_schema=_USER_SCHEMA,
             errors=errors,
         )
 
@@ -61,6 +64,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     def __init__(self, config_entry):
         self.config_entry = config_entry
+        self._schema = vol.Schema({
+            vol.Optional(CONF_HOST, default=config_entry.data.get(CONF_HOST)): str,
+            vol.Optional(CONF_PORT, default=config_entry.data.get(CONF_PORT, DEFAULT_PORT)): vol.Coerce(int),
+        })
 
     async def async_step_init(self, user_input=None):
         """Manage the options for the custom component."""
@@ -71,8 +78,5 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({
-                vol.Optional(CONF_HOST, default=self.config_entry.data.get(CONF_HOST)): str,
-                vol.Optional(CONF_PORT, default=self.config_entry.data.get(CONF_PORT, DEFAULT_PORT)): vol.Coerce(int),
-            }),
+            data_schema=self._schema,
         )
@@ -3,9 +3,14 @@ from __future__ import annotations
 
 import asyncio
 from datetime import timedelta
+from functools import partial
 import logging
-from typing import Optional
-from urllib.parse import quote, urlencode
+import math
+import re
+import time
+from typing import Optional, Union
+from urllib.parse import quote
+from xml.etree import ElementTree
 
 import aiohttp
 from homeassistant.components.media_player import (
@@ -22,7 +27,6 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 import voluptuous as vol
-import xmltodict
 
 from .const import DEFAULT_PORT
 
@@ -32,10 +36,31 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "samsung_soundbar"
 DEFAULT_NAME = "Samsung Soundbar"
 TIMEOUT = 10
+CHUNK_SIZE = 1024
+# UIC replies are a few hundred bytes; anything far larger is not a valid reply.
+MAX_RESPONSE_SIZE = 65536
+XML_CONTENT_TYPES = ("text/xml", "application/xml")
+_TIMEOUT = aiohttp.ClientTimeout(total=TIMEOUT)
 VOLUME_STEP = 1
 
 SCAN_INTERVAL = timedelta(seconds=5)
-
+# Upper bound for the poll interval while the soundbar keeps failing to respond.
+MAX_BACKOFF = timedelta(seconds=60)
+
+# Status keys and the single-value action that reports each of them.
+STATUS_QUERIES = {
+    "power": "GetPowerStatus",
+    "volume": "GetVolume",
+    "mute": "GetMute",
+}
+# Composite action which reports several status keys in a single response.
+MAIN_INFO_ACTION = "GetMainInfo"
+# How long to wait before asking again a soundbar whose main info lacked the status.
+MAIN_INFO_RETRY_INTERVAL = timedelta(minutes=10)
+
+# Home Assistant's platform loader validates YAML config against this voluptuous
+# schema once, before async_setup_platform is called, so the platform reads the
+# already validated values instead of validating them a second time.
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_HOST, default="127.0.0.1"): cv.string,
@@ -60,9 +85,96 @@ def async_setup_platform(
     add_entities([SamsungSoundbarEntity(hass, config[CONF_NAME], host, port)], True)
 
 
+# The fast path only handles UTF-8 replies made of a <UIC> root whose direct children,
+# including <response>, are flat runs of simple ``<tag>text</tag>`` elements. Anything
+# else, such as a nested <response>, markup outside the root or entities, goes to the parser.
+_XML_ENCODING_PATTERN = re.compile(rb"""^<\?xml[^>]*?\sencoding=["']([^"']+)["']""")
+_UIC_PATTERN = re.compile(
+    rb"(?:<\?xml[^>]*\?>)?\s*<UIC(?:\s[^>]*)?(?<!/)>"
+    rb"(?:\s*<(?!response>)(?P<head>[A-Za-z_][\w.-]*)>[^<&]*</(?P=head)>)*"
+    rb"\s*<response(?:\s[^>]*)?(?<!/)>"
+    rb"(?P<response>(?:\s*<(?P<child>[A-Za-z_][\w.-]*)>[^<&]*</(?P=child)>)*\s*)"
+    rb"</response>"
+    rb"(?:\s*<(?P<tail>[A-Za-z_][\w.-]*)>[^<&]*</(?P=tail)>)*"
+    rb"\s*</UIC>\s*"
+)
+_CHILD_PATTERN = re.compile(rb"<([A-Za-z_][\w.-]*)>([^<&]*)</\1>")
+
+
+def _fast_extract_values(data: bytes) -> Optional[dict[str, Optional[str]]]:
+    """Read the children of a flat top-level ``response`` node without an XML parser.
+
+    :param data: The raw XML body returned by the soundbar.
+    :return: A dictionary mapping each child tag to its text (or None when empty), or None
+            if the reply is not simple enough to be read without the XML parser.
+    """
+    encoding = _XML_ENCODING_PATTERN.match(data)
+    if encoding is not None and encoding.group(1).lower() not in (b"utf-8", b"utf8"):
+        return None
+    document = _UIC_PATTERN.fullmatch(data)
+    if document is None:
+        return None
+
+    values: dict[str, Optional[str]] = {}
+    try:
+        for tag, text in _CHILD_PATTERN.findall(document.group("response")):
+            values.setdefault(tag.decode(), text.decode() or None)
+    except UnicodeDecodeError:
+        return None
+    return values
+
+
+def _extract_value(
+    data: bytes, key_to_extract: Union[str, list[str]]
+) -> Union[Optional[str], dict[str, Optional[str]]]:
+    """Extract element texts from the ``response`` node of a UIC reply.
+
+    :param data: The raw XML body returned by the soundbar.
+    :param key_to_extract: The tag name of the element to extract, or a list of tag names.
+    :return: The element text, or None if the element is not present. When a list of keys
+            is given, a dictionary mapping each key to its text (or None) is returned.
+    :raises: ValueError if the reply has no ``response`` node.
+    :raises: xml.etree.ElementTree.ParseError if the reply is not well-formed XML.
+    """
+    values = _fast_extract_values(data)
+    if values is not None:
+        if isinstance(key_to_extract, str):
+            return values.get(key_to_extract)
+        return {key: values.get(key) for key in key_to_extract}
+
+    response = ElementTree.fromstring(data).find("response")
+    if response is None:
+        raise ValueError("Reply has no <response> element")
+
+    def _text(key: str) -> Optional[str]:
+        node = response.find(key)
+        return node.text if node is not None else None
+
+    if isinstance(key_to_extract, str):
+        return _text(key_to_extract)
+    return {key: _text(key) for key in key_to_extract}
+
+
+def _encode_get_cmd(action: str) -> str:
+    """Return the URL-encoded ``<name>`` command for an action.
+
+    :param action: The action name corresponding to the API call for the soundbar.
+    :return: The percent-encoded command, ready to be appended to the ``cmd=`` query.
+    """
+    return quote(f"<name>{action}</name>", safe="")
+
+
 class SoundbarAPI:
     """Representation of Samsung Soundbar."""
 
+    # Encoded commands do not depend on the soundbar, so they are shared by all
+    # instances and the fixed status commands are encoded once at import.
+    _get_cmd_cache: dict[str, str] = {
+        action: _encode_get_cmd(action)
+        for action in (*STATUS_QUERIES.values(), MAIN_INFO_ACTION)
+    }
+    _status_keys = list(STATUS_QUERIES)
+
     def __init__(self, hass: HomeAssistant, host: str, port: int) -> None:
         """Initialize the SoundbarAPI object with the necessary details for API communication.
 
@@ -73,45 +185,140 @@ class SoundbarAPI:
         """
         self.endpoint = f"http://{host}:{port}/UIC"
         self.session = async_get_clientsession(hass)
+        self._base = self.endpoint + "?cmd="
+        self._status_urls = {
+            key: self._base + self._get_cmd_cache[action]
+            for key, action in STATUS_QUERIES.items()
+        }
+        self._main_info_url = self._base + self._get_cmd_cache[MAIN_INFO_ACTION]
+        self._main_info_retry_at = 0.0
+        self._inflight: dict[tuple[str, Union[str, tuple[str, ...]]], asyncio.Future] = {}
+
+    def _encoded_get_cmd(self, action: str) -> str:
+        """Return the URL-encoded ``<name>`` command for an action, encoding it only once.
+
+        :param action: The action name corresponding to the API call for the soundbar.
+        :return: The percent-encoded command, ready to be appended to the ``cmd=`` query.
+        """
+        encoded = self._get_cmd_cache.get(action)
+        if encoded is None:
+            encoded = self._get_cmd_cache[action] = _encode_get_cmd(action)
+        return encoded
 
     async def exec_cmd(
-        self, cmd: str, key_to_extract: str, endpoint: Optional[str] = None
+        self,
+        cmd: str,
+        key_to_extract: Union[str, list[str]],
+        endpoint: Optional[str] = None,
     ):
         """Asynchronously execute a command against the soundbar's API endpoint and extract a specified value.
 
         The function sends a command to the soundbar over HTTP within a specified timeout period,
         parses the XML response, and then returns the value associated with 'key_to_extract'.
+        Commands sent this way, such as the ones from set_value, are never coalesced with
+        identical requests in flight, so every write reaches the soundbar.
 
         :param session: An instance of aiohttp.ClientSession for making HTTP requests.
         :param endpoint: The full URL (including port if necessary) to the soundbar's API endpoint.
         :param cmd: The command string, specific to the soundbar's protocol, to be sent to the endpoint.
         :param key_to_extract: The key that will be used to extract the desired piece of information from
-                            the parsed XML response.
+                            the parsed XML response, or a list of such keys.
         :return: The value from the parsed response associated with 'key_to_extract', or None if the key
-                is not found in the response.
+                is not found in the response. When a list of keys is given, a dictionary of values.
         :raises: aiohttp.ClientError if the HTTP request fails.
         :raises: asyncio.TimeoutError if the request times out based on the specified timeout value.
         """
         endpoint = endpoint or self.endpoint
 
-        query = urlencode({"cmd": cmd}, quote_via=quote)
-        url = f"{endpoint}?{query}"
+        url = f"{endpoint}?cmd={quote(cmd, safe='')}"
+
+        return await self._fetch(url, key_to_extract)
 
-        timeout_obj = aiohttp.ClientTimeout(total=TIMEOUT)
+    async def _exec_url(self, url: str, key_to_extract: Union[str, list[str]]):
+        """Asynchronously request an already encoded command URL and extract a specified value.
 
+        Identical requests issued while one is already in flight share its result instead of
+        being sent to the soundbar again, so this is only used for commands reading values.
+
+        :param url: The full command URL, including the encoded ``cmd`` query.
+        :param key_to_extract: The key that will be used to extract the desired piece of information from
+                            the parsed XML response, or a list of such keys.
+        :return: The value from the parsed response associated with 'key_to_extract', or None if the key
+                is not found in the response. When a list of keys is given, a dictionary of values.
+        :raises: aiohttp.ClientError if the HTTP request fails or the response exceeds MAX_RESPONSE_SIZE.
+        :raises: asyncio.TimeoutError if the request times out based on the specified timeout value.
+        """
+        request_key = (
+            url,
+            key_to_extract if isinstance(key_to_extract, str) else tuple(key_to_extract),
+        )
+        request = self._inflight.get(request_key)
+        if request is None:
+            request = self._inflight[request_key] = asyncio.ensure_future(
+                self._fetch(url, key_to_extract)
+            )
+            request.add_done_callback(partial(self._request_done, request_key))
+
+        # Shield the shared request so a cancelled caller does not cancel it for the others.
+        result = await asyncio.shield(request)
+        return dict(result) if isinstance(result, dict) else result
+
+    def _request_done(self, request_key, request: asyncio.Future) -> None:
+        """Forget a finished in-flight request."""
+        self._inflight.pop(request_key, None)
+        if not request.cancelled():
+            # Retrieve the exception so it is not reported as unhandled when every caller was cancelled.
+            request.exception()
+
+    async def _fetch(self, url: str, key_to_extract: Union[str, list[str]]):
+        """Asynchronously send a request to the soundbar and extract a specified value.
+
+        :param url: The full command URL, including the encoded ``cmd`` query.
+        :param key_to_extract: The key that will be used to extract the desired piece of information from
+                            the parsed XML response, or a list of such keys.
+        :return: The value from the parsed response associated with 'key_to_extract', or None if the key
+                is not found in the response. When a list of keys is given, a dictionary of values.
+        :raises: aiohttp.ClientError if the HTTP request fails, the response is not XML, exceeds
+                MAX_RESPONSE_SIZE or cannot be parsed.
+        :raises: asyncio.TimeoutError if the request times out based on the specified timeout value.
+        """
         try:
-            async with self.session.get(url, timeout=timeout_obj) as response:
-                _LOGGER.debug("Executing: %s with cmd: %s", url, cmd)
+            debug = _LOGGER.isEnabledFor(logging.DEBUG)
+            async with self.session.get(url, timeout=_TIMEOUT) as response:
+                if debug:
+                    _LOGGER.debug("Executing: %s", url)
                 response.raise_for_status()  # Raises an aiohttp.ClientError if the http status is 400 or higher
-                data = await response.text()
-                _LOGGER.debug(data)
-                response_dict = xmltodict.parse(data)
-                return response_dict["UIC"]["response"].get(key_to_extract)
+                # aiohttp reports a missing header as application/octet-stream, so only
+                # reject a content type the soundbar actually sent.
+                if (
+                    aiohttp.hdrs.CONTENT_TYPE in response.headers
+                    and response.content_type not in XML_CONTENT_TYPES
+                ):
+                    raise aiohttp.ClientPayloadError(
+                        f"Unexpected content type {response.content_type}"
+                    )
+
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > MAX_RESPONSE_SIZE:
+                        raise aiohttp.ClientPayloadError(
+                            f"Response exceeds {MAX_RESPONSE_SIZE} bytes"
+                        )
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+                if debug:
+                    _LOGGER.debug("Response: %s", data.decode(errors="replace"))
+                try:
+                    return _extract_value(data, key_to_extract)
+                except (ElementTree.ParseError, ValueError) as err:
+                    raise aiohttp.ClientPayloadError(f"Invalid reply: {err}") from err
         except aiohttp.ClientError as e:
             _LOGGER.error("HTTP request to %s failed: %s", url, e)
             raise  # Rethrow the exception to handle it further up the chain
         except asyncio.TimeoutError:
-            _LOGGER.error("Timeout when executing command: %s", cmd)
+            _LOGGER.error("Timeout when executing command: %s", url)
             raise  # Rethrow the exception to handle it further up the chain
 
     async def get_value(self, action: str, key_to_extract: str):
@@ -121,8 +328,8 @@ class SoundbarAPI:
         :param key_to_extract: The key (parameter) to extract from the API response.
         :return: Returns the value extracted from the XML response for the specified key.
         """
-        cmd = f"<name>{action}</name>"
-        return await self.exec_cmd(cmd, key_to_extract)
+        url = self._base + self._encoded_get_cmd(action)
+        return await self._exec_url(url, key_to_extract)
 
     async def set_value(self, action: str, property_name: str, value):
         """Asynchronously send a command to the soundbar to set a specific value.
@@ -137,19 +344,40 @@ class SoundbarAPI:
         cmd = f'<name>{action}</name><p type="{value_type}" name="{property_name}" val="{value}"/>'
         return await self.exec_cmd(cmd, property_name)
 
-    async def get_soundbar_status(self):
+    async def get_soundbar_status(self, known: Optional[dict[str, str]] = None):
         """Asynchronously retrieve the current status of various soundbar parameters.
 
-        This function makes a series of API calls to get the current state of the soundbar,
-        such as its power state, volume level and mute status. Each API call may need to be
-        customized to fit the specific implementation requirements of the soundbar.
+        The soundbar is first asked for its main info, which reports the power state, volume
+        level and mute status in a single response. Any value missing from that response is
+        then requested with its own API call, issued concurrently so the round-trips overlap.
+        If the main info reports none of the values, it is not requested again until
+        MAIN_INFO_RETRY_INTERVAL has passed.
 
+        :param known: Status values the caller has already read, which are not requested again.
         :return: Returns a dictionary object containing key status parameters of the soundbar.
         """
-        status = {}
-        status["power"] = await self.get_value("<name>GetPowerStatus</name>", "power")
-        status["volume"] = await self.get_value("<name>GetVolume</name>", "volume")
-        status["mute"] = await self.get_value("<name>GetMute</name>", "mute")
+        now = time.monotonic()
+        if now >= self._main_info_retry_at:
+            status = await self._exec_url(self._main_info_url, self._status_keys)
+            if all(value is None for value in status.values()):
+                _LOGGER.debug("%s does not report status, querying it separately", MAIN_INFO_ACTION)
+                self._main_info_retry_at = now + MAIN_INFO_RETRY_INTERVAL.total_seconds()
+        else:
+            status = dict.fromkeys(self._status_keys)
+        for key, value in (known or {}).items():
+            if status.get(key) is None:
+                status[key] = value
+
+        missing = [key for key, value in status.items() if value is None]
+        if missing:
+            status.update(
+                zip(
+                    missing,
+                    await asyncio.gather(
+                        *(self._exec_url(self._status_urls[key], key) for key in missing)
+                    ),
+                )
+            )
 
         return status
 
@@ -157,6 +385,19 @@ class SoundbarAPI:
 class SamsungSoundbarEntity(MediaPlayerEntity):
     """Representation of a Samsung Soundbar entity."""
 
+    __slots__ = (
+        "_name",
+        "_host",
+        "_volume_raw",
+        "_volume_str",
+        "_state",
+        "_is_muted",
+        "_available",
+        "_failures",
+        "_next_poll",
+        "_api",
+    )
+
     _attr_supported_features = (
         MediaPlayerEntityFeature.VOLUME_STEP
         | MediaPlayerEntityFeature.VOLUME_SET
@@ -169,9 +410,13 @@ class SamsungSoundbarEntity(MediaPlayerEntity):
         _LOGGER.info("Initializing Samsung Soundbar")
         self._name = name
         self._host = host
-        self._volume = None
+        self._volume_raw: Optional[float] = None
+        self._volume_str: Optional[str] = None
         self._state = MediaPlayerState.OFF
         self._is_muted = False
+        self._available = True
+        self._failures = 0
+        self._next_poll = 0.0
         self._api = SoundbarAPI(hass, host, port)
 
     @property
@@ -179,6 +424,11 @@ class SamsungSoundbarEntity(MediaPlayerEntity):
         """Return the name of the device."""
         return self._name
 
+    @property
+    def available(self) -> bool:
+        """Return True if the device responded to the last poll."""
+        return self._available
+
     @property
     def state(self) -> None:
         """Return the state of the device."""
@@ -187,7 +437,9 @@ class SamsungSoundbarEntity(MediaPlayerEntity):
     @property
     def volume_level(self) -> None:
         """Return the volume level of the device (0..1)."""
-        return self._volume
+        if self._volume_raw is None:
+            return None
+        return self._volume_raw / 100.0  # Assuming volume is out of 100
 
     @property
     def is_on(self):
@@ -200,20 +452,57 @@ class SamsungSoundbarEntity(MediaPlayerEntity):
         return self._is_muted
 
     async def async_update(self) -> None:
-        """Fetch the latest state from the device."""
-        status = await self._api.get_soundbar_status()
-        self._is_muted = status["mute"] == "on"
-        self._volume = float(status["volume"]) / 100  # Assuming volume is out of 100
+        """Fetch the latest state from the device.
+
+        While the soundbar is off only its power status is polled. After a failed poll, or one
+        returning values that cannot be used, the next ones are skipped with an exponential
+        backoff, up to MAX_BACKOFF.
+        """
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+
+        try:
+            if self._state == STATE_OFF:
+                status = {"power": await self._api.get_value("GetPowerStatus", "power")}
+                if status["power"] != "off":
+                    status = await self._api.get_soundbar_status(status)
+            else:
+                status = await self._api.get_soundbar_status()
+
+            volume = status.get("volume")
+            volume_raw = self._volume_raw
+            if volume is not None and volume != self._volume_str:
+                volume_raw = float(volume)
+                if not math.isfinite(volume_raw):
+                    raise ValueError(f"Invalid volume {volume}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, OverflowError) as err:
+            _LOGGER.debug("Polling %s failed: %s", self._host, err)
+            self._failures += 1
+            backoff = min(SCAN_INTERVAL * 2 ** min(self._failures, 4), MAX_BACKOFF)
+            self._next_poll = now + backoff.total_seconds()
+            self._available = False
+            return
+
+        self._failures = 0
+        self._next_poll = 0.0
+        self._available = True
 
         if status["power"] == "off":
             self._state = STATE_OFF
-        else:
-            # Add additional logic to determine if the state should be STATE_IDLE or another value
-            # For example:
-            # if status['playing']:
-            #     self._state = STATE_PLAYING
-            # else:
-            self._state = STATE_ON  # or STATE_ON if appropriate
+            return
+
+        self._is_muted = status["mute"] == "on"
+        if volume is not None:
+            self._volume_str = volume
+            self._volume_raw = volume_raw
+
+        # Add additional logic to determine if the state should be STATE_IDLE or another value
+        # For example:
+        # if status['playing']:
+        #     self._state = STATE_PLAYING
+        # else:
+        self._state = STATE_ON  # or STATE_ON if appropriate
 
     async def async_mute_volume(self, mute: bool) -> None:
         """Send the mute toggle command."""
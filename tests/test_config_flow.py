@@ -0,0 +1,55 @@
+"""Test the Samsung Soundbar config flow."""
+from http import HTTPStatus
+import re
+from unittest.mock import patch
+
+from homeassistant import config_entries, data_entry_flow
+from homeassistant.const import CONF_HOST, CONF_PORT
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.samsung_soundbar.const import DEFAULT_PORT, DOMAIN
+
+HOST = "192.168.1.2"
+USER_INPUT = {CONF_HOST: HOST, CONF_PORT: DEFAULT_PORT}
+UIC_URL = re.compile(rf"^http://{re.escape(HOST)}:{DEFAULT_PORT}/UIC\?")
+
+
+@pytest.fixture(autouse=True)
+def mock_setup_entry():
+    """Do not set up the created entries."""
+    with patch("custom_components.samsung_soundbar.async_setup_entry", return_value=True):
+        yield
+
+
+async def _submit(hass):
+    """Run the user step with USER_INPUT and return the result."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    return await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+
+
+async def test_failed_connection_is_retried(hass, aioclient_mock):
+    """Test a resubmitted form retries a failed connection right away."""
+    aioclient_mock.get(UIC_URL, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+    result = await _submit(hass)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(UIC_URL)
+    result = await _submit(hass)
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert aioclient_mock.call_count == 1
+
+
+async def test_already_configured_is_not_probed(hass, aioclient_mock):
+    """Test an already configured soundbar aborts without a connection test."""
+    MockConfigEntry(domain=DOMAIN, data=USER_INPUT).add_to_hass(hass)
+    aioclient_mock.get(UIC_URL)
+
+    result = await _submit(hass)
+    assert result["type"] == data_entry_flow.FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert aioclient_mock.call_count == 0
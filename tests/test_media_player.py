@@ -0,0 +1,474 @@
+"""Test the Samsung Soundbar media player."""
+import asyncio
+import re
+from unittest.mock import AsyncMock, Mock, patch
+from xml.etree import ElementTree
+
+import aiohttp
+from homeassistant.const import STATE_OFF, STATE_ON
+import pytest
+
+from custom_components.samsung_soundbar.media_player import (
+    MAIN_INFO_ACTION,
+    MAIN_INFO_RETRY_INTERVAL,
+    MAX_BACKOFF,
+    SCAN_INTERVAL,
+    SamsungSoundbarEntity,
+    SoundbarAPI,
+    _extract_value,
+)
+
+HOST = "192.168.1.2"
+PORT = 56001
+UIC_URL = re.compile(rf"^http://{re.escape(HOST)}:{PORT}/UIC\?")
+MONOTONIC = "custom_components.samsung_soundbar.media_player.time.monotonic"
+
+VOLUME_RESPONSE = (
+    b'<?xml version="1.0" encoding="UTF-8"?>'
+    b'<UIC><method>VolumeLevel</method><version>1.0</version>'
+    b'<speakerip>192.168.1.2</speakerip><user_identifier></user_identifier>'
+    b'<response result="ok"><volume>12</volume></response></UIC>'
+)
+
+
+def test_extract_value():
+    """Test a value is extracted from the response node."""
+    assert _extract_value(VOLUME_RESPONSE, "volume") == "12"
+
+
+def test_extract_value_missing_key():
+    """Test a missing key yields None."""
+    assert _extract_value(VOLUME_RESPONSE, "mute") is None
+
+
+def test_extract_value_list():
+    """Test a list of keys yields a dictionary of values."""
+    assert _extract_value(VOLUME_RESPONSE, ["volume", "mute"]) == {
+        "volume": "12",
+        "mute": None,
+    }
+
+
+def test_extract_value_truncated_reply():
+    """Test a reply cut off before its closing tags is rejected."""
+    data = (
+        b'<UIC><response result="ok"><power>on</power>'
+        b"<volume>12</volume><mute>off</mute>"
+    )
+    with pytest.raises(ElementTree.ParseError):
+        _extract_value(data, ["power", "volume", "mute"])
+
+
+def test_extract_value_escaped_text():
+    """Test values containing entities are decoded by the XML parser fallback."""
+    data = (
+        b"<UIC><method>SpkName</method>"
+        b"<response result=\"ok\"><spkname>Living &amp; Dining</spkname></response></UIC>"
+    )
+    assert _extract_value(data, "spkname") == "Living & Dining"
+
+
+def test_extract_value_empty_element():
+    """Test an empty element yields None."""
+    data = b"<UIC><response result=\"ok\"><volume></volume></response></UIC>"
+    assert _extract_value(data, "volume") is None
+
+
+def test_extract_value_nested_element():
+    """Test only direct children of the response node are read."""
+    data = (
+        b"<UIC><response><info><volume>99</volume></info>"
+        b"<volume>12</volume></response></UIC>"
+    )
+    assert _extract_value(data, "volume") == "12"
+
+
+def test_extract_value_outside_response():
+    """Test elements after the response node are ignored."""
+    data = b"<UIC><response><volume>12</volume></response><mute>on</mute></UIC>"
+    assert _extract_value(data, ["volume", "mute"]) == {"volume": "12", "mute": None}
+
+
+def test_extract_value_similar_tag():
+    """Test a tag which only starts with response is not the response node."""
+    data = (
+        b"<UIC><responseInfo><volume>99</volume></responseInfo>"
+        b"<response><volume>12</volume></response></UIC>"
+    )
+    assert _extract_value(data, "volume") == "12"
+
+
+def test_extract_value_declared_encoding():
+    """Test a non UTF-8 encoding declared in the prolog is honoured."""
+    data = (
+        b'<?xml version="1.0" encoding="ISO-8859-1"?>'
+        b"<UIC><response><spkname>Caf\xe9</spkname></response></UIC>"
+    )
+    assert _extract_value(data, "spkname") == "Caf\xe9"
+
+
+def test_extract_value_nested_response():
+    """Test a response node below the root is not read."""
+    data = b"<UIC><foo><response><volume>12</volume></response></foo></UIC>"
+    with pytest.raises(ValueError):
+        _extract_value(data, "volume")
+
+
+def test_extract_value_garbage_after_response():
+    """Test markup errors after the response node are not skipped."""
+    data = b"<UIC><response><volume>12</volume></response>garbage<<<</UIC>"
+    with pytest.raises(ElementTree.ParseError):
+        _extract_value(data, "volume")
+
+
+def test_extract_value_without_response():
+    """Test a reply without a response node is rejected."""
+    with pytest.raises(ValueError):
+        _extract_value(b"<UIC><method>Error</method></UIC>", "volume")
+
+
+def _mock_fetch(api, replies):
+    """Replace the API transport with canned replies keyed by action name."""
+
+    async def fetch(url, key_to_extract):
+        for action, reply in replies.items():
+            if action in url:
+                if isinstance(reply, Exception):
+                    raise reply
+                return reply
+        raise AssertionError(f"Unexpected request {url}")
+
+    api._fetch = AsyncMock(side_effect=fetch)
+    return api._fetch
+
+
+def _requested(fetch):
+    """Return the action names requested through a mocked transport."""
+    return [
+        action
+        for call in fetch.call_args_list
+        for action in (MAIN_INFO_ACTION, "GetPowerStatus", "GetVolume", "GetMute")
+        if action in call.args[0]
+    ]
+
+
+async def test_status_from_main_info(hass):
+    """Test the status is read from a single main info request."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    fetch = _mock_fetch(
+        api, {MAIN_INFO_ACTION: {"power": "on", "volume": "12", "mute": "off"}}
+    )
+
+    assert await api.get_soundbar_status() == {
+        "power": "on",
+        "volume": "12",
+        "mute": "off",
+    }
+    assert _requested(fetch) == [MAIN_INFO_ACTION]
+
+
+async def test_status_main_info_without_status_is_retried_later(hass):
+    """Test main info lacking the status is skipped, then probed again later."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    fetch = _mock_fetch(
+        api,
+        {
+            MAIN_INFO_ACTION: {"power": None, "volume": None, "mute": None},
+            "GetPowerStatus": "on",
+            "GetVolume": "12",
+            "GetMute": "off",
+        },
+    )
+    with patch(MONOTONIC, return_value=1000.0):
+        assert (await api.get_soundbar_status())["volume"] == "12"
+        fetch.reset_mock()
+        await api.get_soundbar_status()
+    assert MAIN_INFO_ACTION not in _requested(fetch)
+
+    fetch.reset_mock()
+    with patch(
+        MONOTONIC, return_value=1000.0 + MAIN_INFO_RETRY_INTERVAL.total_seconds()
+    ):
+        await api.get_soundbar_status()
+    assert MAIN_INFO_ACTION in _requested(fetch)
+
+
+async def test_status_known_values_are_not_requested(hass):
+    """Test values passed in by the caller are not requested again."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    fetch = _mock_fetch(
+        api,
+        {
+            MAIN_INFO_ACTION: {"power": None, "volume": None, "mute": None},
+            "GetPowerStatus": "on",
+            "GetVolume": "12",
+            "GetMute": "off",
+        },
+    )
+
+    with patch(MONOTONIC, return_value=1000.0):
+        await api.get_soundbar_status()
+        fetch.reset_mock()
+        status = await api.get_soundbar_status({"power": "on"})
+
+    assert status == {"power": "on", "volume": "12", "mute": "off"}
+    assert sorted(_requested(fetch)) == ["GetMute", "GetVolume"]
+
+
+async def test_status_main_info_error_keeps_main_info(hass):
+    """Test a failed main info request does not disable main info."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    fetch = _mock_fetch(api, {MAIN_INFO_ACTION: aiohttp.ClientError()})
+
+    with pytest.raises(aiohttp.ClientError):
+        await api.get_soundbar_status()
+
+    fetch.reset_mock()
+    with pytest.raises(aiohttp.ClientError):
+        await api.get_soundbar_status()
+    assert _requested(fetch) == [MAIN_INFO_ACTION]
+
+
+async def test_fetch_malformed_reply(hass, aioclient_mock):
+    """Test a malformed reply is reported as a client error."""
+    aioclient_mock.get(
+        UIC_URL, content=b"<UIC><response>", headers={"Content-Type": "text/xml"}
+    )
+    api = SoundbarAPI(hass, HOST, PORT)
+
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await api.get_value("GetVolume", "volume")
+
+
+async def test_update_non_xml_reply(hass, aioclient_mock):
+    """Test a reply which is not XML marks the entity unavailable."""
+    aioclient_mock.get(
+        UIC_URL,
+        content=b"<html><body>Not found</body></html>",
+        headers={"Content-Type": "text/html"},
+    )
+    entity = SamsungSoundbarEntity(hass, "Soundbar", HOST, PORT)
+
+    with patch(MONOTONIC, return_value=1000.0):
+        await entity.async_update()
+
+    assert entity.available is False
+    assert entity._failures == 1
+    assert entity.volume_level is None
+
+    entity._state = STATE_ON
+    with patch(MONOTONIC, return_value=entity._next_poll):
+        await entity.async_update()
+
+    assert entity.available is False
+    assert entity._failures == 2
+    assert entity._api._main_info_retry_at == 0.0
+
+
+async def test_update_reply_without_content_type(hass, aioclient_mock):
+    """Test a reply without a Content-Type header is still parsed."""
+    aioclient_mock.get(
+        UIC_URL,
+        content=b"<UIC><response><power>on</power><volume>12</volume><mute>off</mute></response></UIC>",
+    )
+    entity = SamsungSoundbarEntity(hass, "Soundbar", HOST, PORT)
+    entity._state = STATE_ON
+
+    with patch(MONOTONIC, return_value=1000.0):
+        await entity.async_update()
+
+    assert entity.available is True
+    assert entity.volume_level == 0.12
+
+
+def _entity(hass, status=None, power="on"):
+    """Create an entity whose API returns the given replies."""
+    entity = SamsungSoundbarEntity(hass, "Soundbar", HOST, PORT)
+    entity._api = Mock(
+        get_value=AsyncMock(return_value=power),
+        get_soundbar_status=AsyncMock(return_value=status),
+    )
+    return entity
+
+
+async def test_update_off_polls_power_only(hass):
+    """Test only the power status is requested while the soundbar is off."""
+    entity = _entity(hass, power="off")
+
+    await entity.async_update()
+
+    assert entity.state == STATE_OFF
+    entity._api.get_value.assert_awaited_once_with("GetPowerStatus", "power")
+    entity._api.get_soundbar_status.assert_not_awaited()
+
+
+async def test_update_turned_on(hass):
+    """Test the full status is requested once the soundbar reports being on."""
+    entity = _entity(hass, {"power": "on", "volume": "12", "mute": "off"})
+
+    await entity.async_update()
+
+    assert entity.state == STATE_ON
+    assert entity.volume_level == 0.12
+    assert entity.is_volume_muted is False
+    entity._api.get_soundbar_status.assert_awaited_once_with({"power": "on"})
+
+
+async def test_update_backoff(hass):
+    """Test failed polls back off exponentially up to MAX_BACKOFF."""
+    entity = _entity(hass)
+    entity._state = STATE_ON
+    entity._api.get_soundbar_status.side_effect = aiohttp.ClientError
+
+    now = 1000.0
+    delays = []
+    for _ in range(6):
+        with patch(MONOTONIC, return_value=now):
+            await entity.async_update()
+        delays.append(entity._next_poll - now)
+        # Polls before the next scheduled one are skipped.
+        with patch(MONOTONIC, return_value=entity._next_poll - 1):
+            await entity.async_update()
+        now = entity._next_poll
+
+    interval = SCAN_INTERVAL.total_seconds()
+    assert delays == [interval * 2, interval * 4, interval * 8] + [
+        MAX_BACKOFF.total_seconds()
+    ] * 3
+    assert entity._api.get_soundbar_status.await_count == 6
+    assert entity.available is False
+
+
+async def test_update_decimal_volume(hass):
+    """Test a decimal volume is accepted."""
+    entity = _entity(hass, {"power": "on", "volume": "12.5", "mute": "off"})
+    entity._state = STATE_ON
+
+    await entity.async_update()
+
+    assert entity.available is True
+    assert entity.volume_level == 0.125
+
+
+@pytest.mark.parametrize("volume", ["loud", "inf", "nan"])
+async def test_update_invalid_volume_backs_off(hass, volume):
+    """Test an unusable volume marks the entity unavailable."""
+    entity = _entity(hass, {"power": "on", "volume": volume, "mute": "off"})
+    entity._state = STATE_ON
+
+    with patch(MONOTONIC, return_value=1000.0):
+        await entity.async_update()
+
+    assert entity.available is False
+    assert entity._failures == 1
+
+
+async def test_update_recovers(hass):
+    """Test a successful poll after failures resets the backoff."""
+    entity = _entity(hass, {"power": "on", "volume": "12", "mute": "off"})
+    entity._state = STATE_ON
+    entity._api.get_soundbar_status.side_effect = [asyncio.TimeoutError, None]
+
+    with patch(MONOTONIC, return_value=1000.0):
+        await entity.async_update()
+    assert entity.available is False
+
+    entity._api.get_soundbar_status.side_effect = None
+    with patch(MONOTONIC, return_value=entity._next_poll):
+        await entity.async_update()
+
+    assert entity.available is True
+    assert entity._failures == 0
+    assert entity._next_poll == 0.0
+    assert entity.state == STATE_ON
+
+
+def _blocking_fetch(api, reply):
+    """Replace the API transport with one that waits for the returned event."""
+    release = asyncio.Event()
+
+    async def fetch(url, key_to_extract):
+        await release.wait()
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    api._fetch = AsyncMock(side_effect=fetch)
+    return release
+
+
+async def test_identical_reads_are_coalesced(hass):
+    """Test identical reads in flight share one request."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    release = _blocking_fetch(api, "12")
+
+    first = asyncio.ensure_future(api.get_value("GetVolume", "volume"))
+    second = asyncio.ensure_future(api.get_value("GetVolume", "volume"))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == ["12", "12"]
+    assert api._fetch.await_count == 1
+    assert not api._inflight
+
+
+async def test_coalesced_error_reaches_every_caller(hass):
+    """Test a failed shared request raises in every caller."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    release = _blocking_fetch(api, aiohttp.ClientError("boom"))
+
+    first = asyncio.ensure_future(api.get_value("GetVolume", "volume"))
+    second = asyncio.ensure_future(api.get_value("GetVolume", "volume"))
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(first, second, return_exceptions=True)
+    assert all(isinstance(result, aiohttp.ClientError) for result in results)
+    assert api._fetch.await_count == 1
+
+
+async def test_cancelled_caller_keeps_shared_request(hass):
+    """Test cancelling one caller does not cancel the request for the others."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    release = _blocking_fetch(api, "12")
+
+    first = asyncio.ensure_future(api.get_value("GetVolume", "volume"))
+    second = asyncio.ensure_future(api.get_value("GetVolume", "volume"))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "12"
+    assert first.cancelled()
+
+
+async def test_coalesced_callers_get_own_dict(hass):
+    """Test every caller of a shared multi-key read gets its own dictionary."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    release = _blocking_fetch(api, {"power": "on", "volume": None, "mute": None})
+    url = api._main_info_url
+
+    first = asyncio.ensure_future(api._exec_url(url, ["power", "volume", "mute"]))
+    second = asyncio.ensure_future(api._exec_url(url, ["power", "volume", "mute"]))
+    await asyncio.sleep(0)
+    release.set()
+
+    first_status, second_status = await asyncio.gather(first, second)
+    first_status["volume"] = "12"
+    assert second_status["volume"] is None
+    assert api._fetch.await_count == 1
+
+
+async def test_identical_writes_are_not_coalesced(hass):
+    """Test identical writes in flight are all sent to the soundbar."""
+    api = SoundbarAPI(hass, HOST, PORT)
+    release = _blocking_fetch(api, "on")
+
+    first = asyncio.ensure_future(api.set_value("SetMute", "mute", "on"))
+    second = asyncio.ensure_future(api.set_value("SetMute", "mute", "on"))
+    await asyncio.sleep(0)
+    release.set()
+
+    await asyncio.gather(first, second)
+    assert api._fetch.await_count == 2